@@ -13,12 +13,22 @@ Outputs:
 """
 
 import re
+import bisect
+import fnmatch
+import functools
 import glob
 import os
 import math
 import csv
 import argparse
-from collections import defaultdict
+import mmap
+import multiprocessing
+from collections import defaultdict, namedtuple
+
+try:
+    import numpy as _np
+except ImportError:  # optional, like matplotlib; pure-math fallback below
+    _np = None
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────────
@@ -60,52 +70,150 @@ def build_label_map(arg: str):
 # ── Format / mode detection (spec §4) ─────────────────────────────────────────
 # wp_capable: any WRONG-PATH stats line (always in WP binary, even WP OFF)
 # normal:     cpu0->cpu0_ prefix present
-_WP_SIG   = re.compile(r"^(?:cpu0_\w+|LLC) WRONG-PATH\s+ACCESS:", re.MULTILINE)
-_NORM_SIG = re.compile(r"cpu0->cpu0_")
-_WP_MODE  = re.compile(r"Wrong path enabled")
+# The normal-format and WP-mode signatures are plain literals, so they are
+# tested with a C-level substring search instead of a regex.
+_WP_SIG   = re.compile(rb"^(?:cpu0_\w+|LLC) WRONG-PATH\s+ACCESS:", re.MULTILINE)
+_NORM_SIG = b"cpu0->cpu0_"
+_WP_MODE  = b"Wrong path enabled"
 
 # ── ROI (last occurrence, spec §5) ────────────────────────────────────────────
 ROI_RE = re.compile(
-    r"CPU\s+\d+\s+cumulative IPC:\s*([\d.]+)\s+"
-    r"instructions:\s*(\d+)\s+cycles:\s*(\d+)"
-    r"(?:\s+wp_cycles:\s*(\d+))?"
+    rb"CPU\s+\d+\s+cumulative IPC:\s*([\d.]+)\s+"
+    rb"instructions:\s*(\d+)\s+cycles:\s*(\d+)"
+    rb"(?:\s+wp_cycles:\s*(\d+))?"
 )
 
 # ── Branch ────────────────────────────────────────────────────────────────────
-BR_RE    = re.compile(r"Branch Prediction Accuracy:\s*([\d.]+)%\s*MPKI:\s*([\d.]+)")
-BR_DJ_RE = re.compile(r"BRANCH_DIRECT_JUMP:\s*([\d.]+)")
-BR_I_RE  = re.compile(r"BRANCH_INDIRECT:\s*([\d.]+)")
-BR_C_RE  = re.compile(r"BRANCH_CONDITIONAL:\s*([\d.]+)")
-BR_DC_RE = re.compile(r"BRANCH_DIRECT_CALL:\s*([\d.]+)")
-BR_IC_RE = re.compile(r"BRANCH_INDIRECT_CALL:\s*([\d.]+)")
-BR_R_RE  = re.compile(r"BRANCH_RETURN:\s*([\d.]+)")
+BR_RE    = re.compile(rb"Branch Prediction Accuracy:\s*([\d.]+)%\s*MPKI:\s*([\d.]+)")
+BR_DJ_RE = re.compile(rb"BRANCH_DIRECT_JUMP:\s*([\d.]+)")
+BR_I_RE  = re.compile(rb"BRANCH_INDIRECT:\s*([\d.]+)")
+BR_C_RE  = re.compile(rb"BRANCH_CONDITIONAL:\s*([\d.]+)")
+BR_DC_RE = re.compile(rb"BRANCH_DIRECT_CALL:\s*([\d.]+)")
+BR_IC_RE = re.compile(rb"BRANCH_INDIRECT_CALL:\s*([\d.]+)")
+BR_R_RE  = re.compile(rb"BRANCH_RETURN:\s*([\d.]+)")
 
 # ── G2 WP insts (WP binary only, present even when WP OFF) ───────────────────
 WP_INSTS_RE = re.compile(
-    r"wrong_path_insts:\s*(\d+)\s+wrong_path_insts_skipped:\s*(\d+)"
-    r"\s+wrong_path_insts_executed:\s*(\d+)"
+    rb"wrong_path_insts:\s*(\d+)\s+wrong_path_insts_skipped:\s*(\d+)"
+    rb"\s+wrong_path_insts_executed:\s*(\d+)"
 )
-FOOTPRINT_RE = re.compile(r"instr_foot_print:\s*(\d+)\s+data_foot_print:\s*(\d+)")
-ISPF_RE      = re.compile(r"is_prefetch_insts:\s*(\d+)\s+is_prefetch_skipped:\s*(\d+)")
+FOOTPRINT_RE = re.compile(rb"instr_foot_print:\s*(\d+)\s+data_foot_print:\s*(\d+)")
+ISPF_RE      = re.compile(rb"is_prefetch_insts:\s*(\d+)\s+is_prefetch_skipped:\s*(\d+)")
 
 # ── G4 Pipeline / Execute (WP binary only) ────────────────────────────────────
-EXEC_WP_CYC_RE  = re.compile(r"Execute Only WP Cycles\s+(\d+)")
-EXEC_CP_CYC_RE  = re.compile(r"Execute Only CP Cycles\s+(\d+)")
-EXEC_CPWP_RE    = re.compile(r"Execute CP WP Cycles\s+(\d+)")
-ROB_FULL_CYC_RE = re.compile(r"ROB Full Cycles\s+(\d+)")
-ROB_EMPTY_CYC_RE= re.compile(r"ROB Empty Cycles\s+(\d+)")
-ROB_FULL_EVT_RE = re.compile(r"ROB Full Events\s+(\d+)")
-ROB_EMPTY_EVT_RE= re.compile(r"ROB Empty Events\s+(\d+)")
-RESTEER_EVT_RE  = re.compile(r"Resteer Events\s+(\d+)")
-RESTEER_PCT_RE  = re.compile(r"Resteer Penalty\s+([\d.]+)%")
-WP_NA_PCT_RE    = re.compile(r"WP Not Available Count\s+\d+\s+Cycles\s+\d+\s+\(([\d.]+)%\)")
+EXEC_WP_CYC_RE  = re.compile(rb"Execute Only WP Cycles\s+(\d+)")
+EXEC_CP_CYC_RE  = re.compile(rb"Execute Only CP Cycles\s+(\d+)")
+EXEC_CPWP_RE    = re.compile(rb"Execute CP WP Cycles\s+(\d+)")
+ROB_FULL_CYC_RE = re.compile(rb"ROB Full Cycles\s+(\d+)")
+ROB_EMPTY_CYC_RE= re.compile(rb"ROB Empty Cycles\s+(\d+)")
+ROB_FULL_EVT_RE = re.compile(rb"ROB Full Events\s+(\d+)")
+ROB_EMPTY_EVT_RE= re.compile(rb"ROB Empty Events\s+(\d+)")
+RESTEER_EVT_RE  = re.compile(rb"Resteer Events\s+(\d+)")
+RESTEER_PCT_RE  = re.compile(rb"Resteer Penalty\s+([\d.]+)%")
+WP_NA_PCT_RE    = re.compile(rb"WP Not Available Count\s+\d+\s+Cycles\s+\d+\s+\(([\d.]+)%\)")
 
 # ── G7 DRAM ───────────────────────────────────────────────────────────────────
 # ROW_BUFFER_MISS is on the next indented line → \s+ crosses the newline
 DRAM_RE = re.compile(
-    r"Channel 0 RQ ROW_BUFFER_HIT:\s*(\d+)\s+ROW_BUFFER_MISS:\s*(\d+)"
+    rb"Channel 0 RQ ROW_BUFFER_HIT:\s*(\d+)\s+ROW_BUFFER_MISS:\s*(\d+)"
 )
 
+# ── Combined single-pass scan ─────────────────────────────────────────────────
+# The global (non-per-level) fields used to be collected with ~20 independent
+# re.search calls, each rescanning the whole text. One alternation scanned with
+# finditer bounds the work by bytes in the file, not by pattern count; every
+# branch starts with a distinct literal so the engine's literal-prefix fast
+# path still applies. ROI stays separate (spec §5 wants the last occurrence);
+# per-cache/TLB patterns stay separate because they are selected per level and
+# format.
+_SCAN_SOURCES = [
+    ("branch",        BR_RE),
+    ("br_dj",         BR_DJ_RE),
+    ("br_i",          BR_I_RE),
+    ("br_c",          BR_C_RE),
+    ("br_dc",         BR_DC_RE),
+    ("br_ic",         BR_IC_RE),
+    ("br_r",          BR_R_RE),
+    ("wp_insts",      WP_INSTS_RE),
+    ("footprint",     FOOTPRINT_RE),
+    ("ispf",          ISPF_RE),
+    ("exec_wp",       EXEC_WP_CYC_RE),
+    ("exec_cp",       EXEC_CP_CYC_RE),
+    ("exec_cpwp",     EXEC_CPWP_RE),
+    ("rob_full_cyc",  ROB_FULL_CYC_RE),
+    ("rob_empty_cyc", ROB_EMPTY_CYC_RE),
+    ("rob_full_evt",  ROB_FULL_EVT_RE),
+    ("rob_empty_evt", ROB_EMPTY_EVT_RE),
+    ("resteer_evt",   RESTEER_EVT_RE),
+    ("resteer_pct",   RESTEER_PCT_RE),
+    ("wp_na",         WP_NA_PCT_RE),
+    ("dram",          DRAM_RE),
+]
+
+class _CombinedScan:
+    """Alternation of named patterns, scanned in one finditer pass.
+
+    Built from [(name, compiled_pattern)] pairs. scan() returns
+    {name: tuple of that pattern's groups}, keeping the first hit per name
+    (matching independent re.search semantics) and stopping early once
+    every name has matched. m.lastindex lands on the matching
+    alternative's innermost group, so it is mapped back to the
+    alternative's name by bisecting the sorted outer group numbers.
+    """
+
+    def __init__(self, sources, flags=0):
+        self.pattern = re.compile(
+            b"|".join(
+                b"(?P<" + name.encode("ascii") + b">" + pat.pattern + b")"
+                for name, pat in sources
+            ),
+            flags,
+        )
+        gi = self.pattern.groupindex
+        # For each alternative, the 0-based slice of m.groups() holding its
+        # own capture groups (the outer named group is at gi[name] - 1).
+        self.slices = {name: (gi[name], gi[name] + pat.groups) for name, pat in sources}
+        starts = sorted((gi[name], name) for name, _ in sources)
+        self.idx = [g for g, _ in starts]
+        self.names = [n for _, n in starts]
+
+    def scan(self, text, pos=0):
+        hits = {}
+        want = len(self.names)
+        for m in self.pattern.finditer(text, pos):
+            name = self.names[bisect.bisect_right(self.idx, m.lastindex) - 1]
+            if name not in hits:
+                lo, hi = self.slices[name]
+                hits[name] = m.groups()[lo:hi]
+                if len(hits) == want:
+                    break
+        return hits
+
+
+ALL_PATTERNS = _CombinedScan(_SCAN_SOURCES)
+
+
+def scan_all(text, pos=0):
+    """Single pass of ALL_PATTERNS over text[pos:] → {name: tuple of groups}.
+
+    pos lets the caller skip the pre-ROI part of the log without slicing.
+    """
+    return ALL_PATTERNS.scan(text, pos)
+
+
+def _hit_int(hits, name, idx=0):
+    vals = hits.get(name)
+    if not vals or vals[idx] is None:
+        return None
+    return int(vals[idx])
+
+
+def _hit_float(hits, name, idx=0):
+    vals = hits.get(name)
+    if not vals:
+        return None
+    return safe_float(vals[idx])
+
 # ── Column schema (SUMMARY_SPEC.md §16) ───────────────────────────────────────
 # 29 fields per cache level (l1d/l1i/l2c/llc)
 _CACHE_FIELDS = [
@@ -243,192 +351,373 @@ def _tlb_prefix(tlv, fmt):
                 "stlb": "cpu0_STLB"}[tlv]
 
 
+# ── Precompiled per-level patterns (spec §16) ─────────────────────────────────
+# Built once at import so parse_cache_level/parse_tlb_level only call .search on
+# prebuilt objects instead of re-assembling (and re-escaping) pattern strings
+# per field per file.
+
+_CachePats = namedtuple("_CachePats", ["prefix", "scanner", "wp"])
+
+_TlbPats = namedtuple("_TlbPats", ["prefix", "scanner", "wp"])
+
+
+def _compile_cache_pats(pfx, fmt):
+    # The prefixes ("cpu0->cpu0_L1D", "LLC", ...) contain no regex
+    # metacharacters, so they are spliced in verbatim; an unescaped literal
+    # run keeps the compiled pattern eligible for sre's literal-prefix
+    # fast path.
+    bpfx = pfx.encode("ascii")
+
+    # Line anchoring is spelled (?:^|\n) so the combined scanner does not
+    # need re.MULTILINE's per-position line bookkeeping; ^ without the flag
+    # only matches at the start of a truncated log.
+    def C(pat):
+        return re.compile(rb"(?:^|\n)" + bpfx + rb" " + pat)
+
+    sources = [
+        ("load",     C(rb"LOAD\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")),
+        ("prefetch", C(rb"PREFETCH\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")),
+        ("pf_req",   C(rb"PREFETCH REQUESTED:\s*(\d+)\s+ISSUED:\s*(\d+)\s+USEFUL:\s*(\d+)\s+USELESS:\s*(\d+)")),
+    ]
+    if fmt == "normal":
+        sources.append(("miss_lat", C(rb"AVERAGE MISS LATENCY:\s*([\S]+) cycles")))
+        return _CachePats(bpfx, _CombinedScan(sources), False)
+    sources += [
+        ("miss_lat",    C(rb"AVERAGE DATA MISS LATENCY:\s*([\S]+) cycles")),
+        ("wp",          C(rb"WRONG-PATH ACCESS:\s*(\d+)\s+LOAD:\s*\d+\s+USEFULL:\s*(\d+)"
+                          rb"\s+FILL:\s*(\d+)\s+USELESS:\s*(\d+)")),
+        ("pollution",   C(rb"POLLUTION:\s*([\S]+)\s+WP_FILL:\s*(\d+)\s+WP_MISS:\s*(\d+)"
+                          rb"\s+CP_FILL:\s*(\d+)\s+CP_MISS:\s*(\d+)")),
+        ("data_req",    C(rb"DATA REQ:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)"
+                          rb"\s+WP_REQ:\s*(\d+)\s+WP_HIT:\s*(\d+)\s+WP_MISS:\s*(\d+)")),
+        ("wp_miss_lat", C(rb"AVERAGE WP DATA MISS LATENCY:\s*([\S]+) cycles")),
+        ("cp_miss_lat", C(rb"AVERAGE CP DATA MISS LATENCY:\s*([\S]+) cycles")),
+    ]
+    return _CachePats(bpfx, _CombinedScan(sources), True)
+
+
+def _compile_tlb_pats(pfx, fmt):
+    # Prefixes are metacharacter-free and anchoring avoids re.MULTILINE;
+    # see _compile_cache_pats.
+    bpfx = pfx.encode("ascii")
+
+    def C(pat):
+        return re.compile(rb"(?:^|\n)" + bpfx + rb" " + pat)
+
+    sources = [
+        ("load", C(rb"LOAD\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")),
+    ]
+    if fmt == "normal":
+        sources.append(("miss_lat", C(rb"AVERAGE MISS LATENCY:\s*([\S]+) cycles")))
+        return _TlbPats(bpfx, _CombinedScan(sources), False)
+    sources += [
+        ("miss_lat",    C(rb"AVERAGE DATA MISS LATENCY:\s*([\S]+) cycles")),
+        ("wp",          C(rb"WRONG-PATH ACCESS:\s*(\d+)\s+LOAD:\s*\d+\s+USEFULL:\s*(\d+)"
+                          rb"\s+FILL:\s*\d+\s+USELESS:\s*(\d+)")),
+        ("wp_miss_lat", C(rb"AVERAGE WP DATA MISS LATENCY:\s*([\S]+) cycles")),
+        ("cp_miss_lat", C(rb"AVERAGE CP DATA MISS LATENCY:\s*([\S]+) cycles")),
+    ]
+    return _TlbPats(bpfx, _CombinedScan(sources), True)
+
+
+# Keyed by format first so a file resolves its whole pattern set with one
+# lookup instead of a (level, format) lookup per level.
+_CACHE_PATTERNS = {
+    fmt: {lv: _compile_cache_pats(_cache_prefix(lv, fmt), fmt)
+          for lv in ["l1d", "l1i", "l2c", "llc"]}
+    for fmt in ["normal", "wp_capable"]
+}
+
+_TLB_PATTERNS = {
+    fmt: {tlv: _compile_tlb_pats(_tlb_prefix(tlv, fmt), fmt)
+          for tlv in ["dtlb", "itlb", "stlb"]}
+    for fmt in ["normal", "wp_capable"]
+}
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def label_from_name(fname, label_map):
-    base = os.path.basename(fname)
-    for key, lab in label_map:
-        if key and (key in fname or key in base):
-            return lab
-    return "unknown"
+def find_log_paths(pattern):
+    """Expand the --glob pattern with a single scandir pass.
+
+    glob.glob routes every entry through several layers of per-name
+    fnmatch; for a flat directory of thousands of logs one scandir plus
+    one compiled fnmatch regex is cheaper. Patterns with wildcards in
+    the directory part fall back to glob.
+    """
+    dirname, name_pat = os.path.split(pattern)
+    if glob.has_magic(dirname):
+        return sorted(glob.glob(pattern))
+    name_re = re.compile(fnmatch.translate(name_pat))
+    hidden_ok = name_pat.startswith(".")
+    try:
+        entries = os.scandir(dirname or ".")
+    except OSError:
+        return []
+    with entries:
+        return sorted(
+            os.path.join(dirname, e.name) if dirname else e.name
+            for e in entries
+            if (hidden_ok or not e.name.startswith(".")) and name_re.match(e.name)
+        )
+
+
+def make_label_matcher(label_map):
+    """Build a fname → label function from the substring:label map.
+
+    Keys are tested with `in` in map order and the first key found wins,
+    exactly like the old per-file loop. (An alternation regex is not
+    equivalent here: finditer yields non-overlapping matches, so a
+    higher-priority key starting inside another key's match — e.g. "sim"
+    inside "ChampSim" — would never be seen.)
+    """
+    pairs = [(k, v) for k, v in label_map if k]
+
+    # Scanning the basename is enough (the config markers live in the
+    # file name, not the directory), and memoizing on it dedups repeated
+    # lookups across reruns of the same names; each `in` test is a
+    # single C-level substring search.
+    @functools.lru_cache(maxsize=None)
+    def _label(base):
+        for k, v in pairs:
+            if k in base:
+                return v
+        return "unknown"
+
+    def label_for(fname):
+        return _label(os.path.basename(fname))
+
+    return label_for
+
+
+# Strips, in one pass: the leading index ("00_", "12_"), the binary/job
+# suffix from "_ChampSim" on (with a ".gz" immediately before it, which the
+# old three-sub chain removed after cutting the suffix), and a trailing ".gz".
+_BENCH_CLEAN = re.compile(r"^\d+_|(?:\.gz)?_ChampSim.*$|\.gz$")
 
 
 def bench_from_name(fname):
     base = os.path.splitext(os.path.basename(fname))[0]
-    base = re.sub(r"_ChampSim.*$", "", base)   # strip binary/job suffix
-    base = re.sub(r"^\d+_", "", base)           # strip leading index "00_", "12_"
-    base = re.sub(r"\.gz$", "", base)           # strip .gz extension
-    return base
+    return _BENCH_CLEAN.sub("", base)
+
+
+_INF = float("inf")
 
 
 def safe_float(s):
     """Parse float; return None for NaN, inf, '-', or unparseable values."""
     try:
         v = float(s)
-        if math.isnan(v) or math.isinf(v):
-            return None
-        return v
     except (TypeError, ValueError):
         return None
+    # v != v is the NaN self-comparison trick and the two compares cover
+    # ±inf, skipping the math.isnan/math.isinf calls on the valid path.
+    if v != v or v == _INF or v == -_INF:
+        return None
+    return v
 
 
 def last_roi(text):
-    """Return the last ROI match (spec §5: use last occurrence)."""
-    m = None
-    for m in ROI_RE.finditer(text):
-        pass
-    return m
-
+    """Return the last ROI match (spec §5: use last occurrence).
 
-def mpki_val(miss, inst):
-    if miss is None or inst is None or inst == 0:
-        return None
-    return miss * 1000.0 / inst
+    Rather than running the regex over the whole file and keeping the
+    final hit, rfind() the fixed "cumulative IPC:" substring from the end
+    and anchor the regex at that line; heartbeat ROI lines earlier in the
+    log are never touched.  If the candidate line does not parse (e.g. a
+    truncated log), step back to the previous occurrence.
+    """
+    pos = len(text)
+    while True:
+        hit = text.rfind(b"cumulative IPC:", 0, pos)
+        if hit < 0:
+            return None
+        start = text.rfind(b"\n", 0, hit) + 1
+        m = ROI_RE.search(text, start)
+        if m:
+            return m
+        pos = start
 
 
 def geomean(lst):
     vals = [v for v in lst if v and v > 0]
     if not vals:
         return None
-    return math.exp(sum(math.log(x) for x in vals) / len(vals))
-
-
-def fmt(v, field=""):
-    """Format a cell value for CSV output (None → empty string).
-
-    Precision rules:
+    n = len(vals)
+    if n == 1:
+        return vals[0]
+    if n <= 32 and 1e-9 < min(vals) and max(vals) < 1e9:
+        # Typical sweeps have a handful of configs; a single pow beats
+        # n+1 transcendental calls. The bounds keep the 32-term product
+        # inside 1e+/-288, clear of double overflow/underflow.
+        return math.prod(vals) ** (1.0 / n)
+    if _np is not None:
+        # One vectorized log over a contiguous array instead of a Python
+        # loop of math.log calls; pays off on large sweeps.
+        return float(_np.exp(_np.log(_np.asarray(vals)).mean()))
+    # fsum keeps the log-sum exact to the final rounding; at 33+ terms the
+    # extra cost is noise.
+    return math.exp(math.fsum(map(math.log, vals)) / n)
+
+
+def _formatter_for(field):
+    """Return the cell formatter for one column (None → empty string).
+
+    Precision rules for float columns:
       *_lat, *_miss_lat  → 4 sig figs (g format)
       *_mpki             → 4 decimal places
       *_percent, *_pct   → 2 decimal places
       ipc                → 6 decimal places
-      other floats       → 4 decimal places
+      *_pollution        → 4 decimal places
+
+    Every other column carries integer counts or identifier strings, so
+    its formatter is a bare str() with no isinstance check. The suffix
+    dispatch runs once per column at import; the per-cell lookup in
+    FORMATTERS is O(1).
     """
-    if v is None:
-        return ""
-    if isinstance(v, float):
-        if "_lat" in field:
-            return f"{v:.4g}"
-        if "_mpki" in field:
-            return f"{v:.4f}"
-        if "_percent" in field or "_pct" in field:
-            return f"{v:.2f}"
-        if field == "ipc":
-            return f"{v:.6f}"
-        return f"{v:.4f}"
-    return str(v)
-
-
-def _getint(m, grp):
-    """Safely extract an integer group from a match object."""
-    try:
-        return int(m.group(grp)) if m else None
-    except (IndexError, TypeError):
-        return None
+    if "_lat" in field:
+        spec = ".4g"
+    elif "_mpki" in field:
+        spec = ".4f"
+    elif "_percent" in field or "_pct" in field:
+        spec = ".2f"
+    elif field == "ipc":
+        spec = ".6f"
+    elif field.endswith("_pollution"):
+        spec = ".4f"
+    else:
+        return lambda v: "" if v is None else str(v)
 
+    def _fmt(v, _spec=spec):
+        if v is None:
+            return ""
+        if isinstance(v, float):
+            return format(v, _spec)
+        return str(v)
 
-def _getfloat(m, grp):
-    """Safely extract a safe_float group from a match object."""
-    try:
-        return safe_float(m.group(grp)) if m else None
-    except (IndexError, TypeError):
-        return None
+    return _fmt
+
+
+# One formatter per column; FULL_FIELDNAMES is a superset of the normal and
+# summary schemas, so a single table serves every writer.
+FORMATTERS = {k: _formatter_for(k) for k in FULL_FIELDNAMES}
+
+
+def schema_columns(fields):
+    """Pair each column with its formatter once per schema selection."""
+    return [(k, FORMATTERS[k]) for k in fields]
+
+
+def write_csv_row(f, cols, r):
+    """Write one metrics row as a CSV line (CRLF, csv-module compatible).
+
+    cols is a schema_columns() list, so the per-cell work is one dict
+    lookup on the row plus the specialized formatter call — no FORMATTERS
+    hashing per cell.
+    """
+    get = r.get
+    f.write(",".join(fmt(get(k)) for k, fmt in cols) + "\r\n")
 
 
 # ── Per-level cache parser (returns 29-field dict) ────────────────────────────
 
-def parse_cache_level(text, lv, fmt_str, wp_on, inst):
+def parse_cache_level(text, lv, pats, wp_on, inst, pos=0):
     """
     Parse all 29 cache-level fields for one level.
     lv:     column prefix (e.g. 'l1d', 'llc')
-    fmt_str: 'normal' or 'wp_capable'
+    pats:   _CachePats for this level, from _CACHE_PATTERNS[fmt]
     wp_on:  True if wp_mode == 'on'
     inst:   ROI instruction count (for MPKI)
+    pos:    offset to start searching from (end of last ROI line)
     """
-    pfx = _cache_prefix(lv, fmt_str)
-    ep  = re.escape(pfx)
 
-    def S(pat, flags=re.MULTILINE):
-        return re.search(r"^" + ep + r" " + pat, text, flags)
+    # Prefilter: locate this level's first stats line once; if the prefix
+    # never appears, skip all regex work. All field searches start there
+    # instead of rescanning from the top of the file.
+    ppos = text.find(pats.prefix, pos)
+    if ppos < 0:
+        return dict.fromkeys(f"{lv}_{f}" for f in _CACHE_FIELDS)
+
+    # One finditer pass over the level's stats block collects every field
+    # line; the scan starts one byte early so the leading \n of the line
+    # anchor is inside the window.
+    hits = pats.scanner.scan(text, ppos - 1 if ppos else 0)
 
     # LOAD
-    m = S(r"LOAD\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")
-    load_access = _getint(m, 1)
-    load_hit    = _getint(m, 2)
-    load_miss   = _getint(m, 3)
+    load_access = _hit_int(hits, "load", 0)
+    load_hit    = _hit_int(hits, "load", 1)
+    load_miss   = _hit_int(hits, "load", 2)
 
     # PREFETCH ACCESS
-    m = S(r"PREFETCH\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")
-    pf_access = _getint(m, 1)
-    pf_hit    = _getint(m, 2)
-    pf_miss   = _getint(m, 3)
+    pf_access = _hit_int(hits, "prefetch", 0)
+    pf_hit    = _hit_int(hits, "prefetch", 1)
+    pf_miss   = _hit_int(hits, "prefetch", 2)
 
     # PREFETCH REQUESTED
-    m = S(r"PREFETCH REQUESTED:\s*(\d+)\s+ISSUED:\s*(\d+)\s+USEFUL:\s*(\d+)\s+USELESS:\s*(\d+)")
-    pf_requested = _getint(m, 1)
-    pf_issued    = _getint(m, 2)
-    pf_useful    = _getint(m, 3)
-    pf_useless   = _getint(m, 4)
+    pf_requested = _hit_int(hits, "pf_req", 0)
+    pf_issued    = _hit_int(hits, "pf_req", 1)
+    pf_useful    = _hit_int(hits, "pf_req", 2)
+    pf_useless   = _hit_int(hits, "pf_req", 3)
 
     # Miss latency
-    if fmt_str == "normal":
-        m = S(r"AVERAGE MISS LATENCY:\s*([\S]+) cycles")
-    else:
-        m = S(r"AVERAGE DATA MISS LATENCY:\s*([\S]+) cycles")
-    miss_lat = _getfloat(m, 1)
+    miss_lat = _hit_float(hits, "miss_lat", 0)
+
+    # Normal format: the WP-only columns are always blank, so fill them
+    # from a None template instead of threading 15 explicit Nones through
+    # the full dict build below.
+    if not pats.wp:
+        row = dict.fromkeys(f"{lv}_{f}" for f in _CACHE_FIELDS)
+        row[f"{lv}_load_access"]  = load_access
+        row[f"{lv}_load_hit"]     = load_hit
+        row[f"{lv}_load_miss"]    = load_miss
+        row[f"{lv}_load_mpki"]    = load_miss * 1000.0 / inst if load_miss is not None and inst else None
+        row[f"{lv}_pf_access"]    = pf_access
+        row[f"{lv}_pf_hit"]       = pf_hit
+        row[f"{lv}_pf_miss"]      = pf_miss
+        row[f"{lv}_pf_requested"] = pf_requested
+        row[f"{lv}_pf_issued"]    = pf_issued
+        row[f"{lv}_pf_useful"]    = pf_useful
+        row[f"{lv}_pf_useless"]   = pf_useless
+        row[f"{lv}_miss_lat"]     = miss_lat
+        return row
 
     # WP-capable-only fields
-    if fmt_str == "wp_capable":
-        # WRONG-PATH
-        m = S(r"WRONG-PATH ACCESS:\s*(\d+)\s+LOAD:\s*\d+\s+USEFULL:\s*(\d+)"
-              r"\s+FILL:\s*(\d+)\s+USELESS:\s*(\d+)")
-        wp_access  = _getint(m, 1)
-        wp_useful  = _getint(m, 2)
-        wp_fill    = _getint(m, 3)
-        wp_useless = _getint(m, 4)
-
-        # POLLUTION
-        m = S(r"POLLUTION:\s*([\S]+)\s+WP_FILL:\s*(\d+)\s+WP_MISS:\s*(\d+)"
-              r"\s+CP_FILL:\s*(\d+)\s+CP_MISS:\s*(\d+)")
-        pollution   = _getfloat(m, 1)
-        pol_wp_fill = _getint(m, 2)
-        pol_wp_miss = _getint(m, 3)
-        pol_cp_fill = _getint(m, 4)
-        pol_cp_miss = _getint(m, 5)
-
-        # DATA REQ
-        m = S(r"DATA REQ:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)"
-              r"\s+WP_REQ:\s*(\d+)\s+WP_HIT:\s*(\d+)\s+WP_MISS:\s*(\d+)")
-        data_req    = _getint(m, 1)
-        data_hit    = _getint(m, 2)
-        data_miss   = _getint(m, 3)
-        data_wp_req = _getint(m, 4)
-        data_wp_hit = _getint(m, 5)
-        data_wp_miss= _getint(m, 6)
-
-        # WP/CP latency
-        m = S(r"AVERAGE WP DATA MISS LATENCY:\s*([\S]+) cycles")
-        wp_miss_lat = _getfloat(m, 1)
-        m = S(r"AVERAGE CP DATA MISS LATENCY:\s*([\S]+) cycles")
-        cp_miss_lat = _getfloat(m, 1)
-
-        # Suppress WP-activity fields when WP is off (spec §16)
-        # pollution ratio is 0/0 = undefined when WP OFF → blank
-        if not wp_on:
-            wp_access = wp_useful = wp_fill = wp_useless = None
-            pollution = pol_wp_fill = pol_wp_miss = None
-            data_wp_req = data_wp_hit = data_wp_miss = None
-    else:
+    # WRONG-PATH
+    wp_access  = _hit_int(hits, "wp", 0)
+    wp_useful  = _hit_int(hits, "wp", 1)
+    wp_fill    = _hit_int(hits, "wp", 2)
+    wp_useless = _hit_int(hits, "wp", 3)
+
+    # POLLUTION
+    pollution   = _hit_float(hits, "pollution", 0)
+    pol_wp_fill = _hit_int(hits, "pollution", 1)
+    pol_wp_miss = _hit_int(hits, "pollution", 2)
+    pol_cp_fill = _hit_int(hits, "pollution", 3)
+    pol_cp_miss = _hit_int(hits, "pollution", 4)
+
+    # DATA REQ
+    data_req    = _hit_int(hits, "data_req", 0)
+    data_hit    = _hit_int(hits, "data_req", 1)
+    data_miss   = _hit_int(hits, "data_req", 2)
+    data_wp_req = _hit_int(hits, "data_req", 3)
+    data_wp_hit = _hit_int(hits, "data_req", 4)
+    data_wp_miss= _hit_int(hits, "data_req", 5)
+
+    # WP/CP latency
+    wp_miss_lat = _hit_float(hits, "wp_miss_lat", 0)
+    cp_miss_lat = _hit_float(hits, "cp_miss_lat", 0)
+
+    # Suppress WP-activity fields when WP is off (spec §16)
+    # pollution ratio is 0/0 = undefined when WP OFF → blank
+    if not wp_on:
         wp_access = wp_useful = wp_fill = wp_useless = None
-        pollution = pol_wp_fill = pol_wp_miss = pol_cp_fill = pol_cp_miss = None
-        data_req = data_hit = data_miss = None
+        pollution = pol_wp_fill = pol_wp_miss = None
         data_wp_req = data_wp_hit = data_wp_miss = None
-        wp_miss_lat = cp_miss_lat = None
 
     return {
         f"{lv}_load_access":  load_access,
         f"{lv}_load_hit":     load_hit,
         f"{lv}_load_miss":    load_miss,
-        f"{lv}_load_mpki":    mpki_val(load_miss, inst),
+        f"{lv}_load_mpki":    load_miss * 1000.0 / inst if load_miss is not None and inst else None,
         f"{lv}_pf_access":    pf_access,
         f"{lv}_pf_hit":       pf_hit,
         f"{lv}_pf_miss":      pf_miss,
@@ -459,57 +748,60 @@ def parse_cache_level(text, lv, fmt_str, wp_on, inst):
 
 # ── Per-level TLB parser (returns 10-field dict) ──────────────────────────────
 
-def parse_tlb_level(text, tlv, fmt_str, wp_on, inst):
+def parse_tlb_level(text, tlv, pats, wp_on, inst, pos=0):
     """
     Parse all 10 TLB-level fields for one TLB.
     tlv:    column prefix (e.g. 'dtlb')
-    fmt_str: 'normal' or 'wp_capable'
+    pats:   _TlbPats for this TLB, from _TLB_PATTERNS[fmt]
     wp_on:  True if wp_mode == 'on'
     inst:   ROI instruction count (for MPKI)
+    pos:    offset to start searching from (end of last ROI line)
     """
-    pfx = _tlb_prefix(tlv, fmt_str)
-    ep  = re.escape(pfx)
 
-    def S(pat, flags=re.MULTILINE):
-        return re.search(r"^" + ep + r" " + pat, text, flags)
+    # Prefilter: locate this TLB's first stats line once; if the prefix never
+    # appears, skip all regex work.
+    ppos = text.find(pats.prefix, pos)
+    if ppos < 0:
+        return dict.fromkeys(f"{tlv}_{f}" for f in _TLB_FIELDS)
+
+    # One finditer pass over the TLB's stats block collects every field
+    # line, starting one byte early for the line anchor's leading \n.
+    hits = pats.scanner.scan(text, ppos - 1 if ppos else 0)
 
     # Use LOAD line for access/hit/miss (TLBs have LOAD = TOTAL for access)
-    m = S(r"LOAD\s+ACCESS:\s*(\d+)\s+HIT:\s*(\d+)\s+MISS:\s*(\d+)")
-    access = _getint(m, 1)
-    hit    = _getint(m, 2)
-    miss   = _getint(m, 3)
+    access = _hit_int(hits, "load", 0)
+    hit    = _hit_int(hits, "load", 1)
+    miss   = _hit_int(hits, "load", 2)
 
     # Miss latency
-    if fmt_str == "normal":
-        m = S(r"AVERAGE MISS LATENCY:\s*([\S]+) cycles")
-    else:
-        m = S(r"AVERAGE DATA MISS LATENCY:\s*([\S]+) cycles")
-    miss_lat = _getfloat(m, 1)
+    miss_lat = _hit_float(hits, "miss_lat", 0)
+
+    # Normal format: WP-only columns are always blank (see parse_cache_level)
+    if not pats.wp:
+        row = dict.fromkeys(f"{tlv}_{f}" for f in _TLB_FIELDS)
+        row[f"{tlv}_access"]   = access
+        row[f"{tlv}_hit"]      = hit
+        row[f"{tlv}_miss"]     = miss
+        row[f"{tlv}_mpki"]     = miss * 1000.0 / inst if miss is not None and inst else None
+        row[f"{tlv}_miss_lat"] = miss_lat
+        return row
 
     # WP-capable-only
-    if fmt_str == "wp_capable":
-        m = S(r"WRONG-PATH ACCESS:\s*(\d+)\s+LOAD:\s*\d+\s+USEFULL:\s*(\d+)"
-              r"\s+FILL:\s*\d+\s+USELESS:\s*(\d+)")
-        wp_access  = _getint(m, 1)
-        wp_useful  = _getint(m, 2)
-        wp_useless = _getint(m, 3)
-
-        m = S(r"AVERAGE WP DATA MISS LATENCY:\s*([\S]+) cycles")
-        wp_miss_lat = _getfloat(m, 1)
-        m = S(r"AVERAGE CP DATA MISS LATENCY:\s*([\S]+) cycles")
-        cp_miss_lat = _getfloat(m, 1)
-
-        if not wp_on:
-            wp_access = wp_useful = wp_useless = None
-    else:
+    wp_access  = _hit_int(hits, "wp", 0)
+    wp_useful  = _hit_int(hits, "wp", 1)
+    wp_useless = _hit_int(hits, "wp", 2)
+
+    wp_miss_lat = _hit_float(hits, "wp_miss_lat", 0)
+    cp_miss_lat = _hit_float(hits, "cp_miss_lat", 0)
+
+    if not wp_on:
         wp_access = wp_useful = wp_useless = None
-        wp_miss_lat = cp_miss_lat = None
 
     return {
         f"{tlv}_access":      access,
         f"{tlv}_hit":         hit,
         f"{tlv}_miss":        miss,
-        f"{tlv}_mpki":        mpki_val(miss, inst),
+        f"{tlv}_mpki":        miss * 1000.0 / inst if miss is not None and inst else None,
         f"{tlv}_wp_access":   wp_access,
         f"{tlv}_wp_useful":   wp_useful,
         f"{tlv}_wp_useless":  wp_useless,
@@ -529,21 +821,44 @@ def parse_one_file(path):
         (row_dict, None, None)          on success
         (None, error_code, detail_str)  on hard error (row skipped per spec §11.2)
     """
+    # Logs are pure ASCII, so they are scanned as bytes: mmap avoids copying
+    # the file into a Python str and skips the UTF-8 decode entirely. The
+    # regexes and literal signatures above are compiled in bytes mode.
+    # The 1 MiB buffer only matters for the plain-read fallback: the default
+    # 8 KB buffer costs a read() syscall per 8 KB on GB-scale logs. The mmap
+    # path bypasses the buffer entirely.
     try:
-        text = open(path, "r", errors="ignore").read()
+        f = open(path, "rb", buffering=1 << 20)
     except Exception as e:
         return None, "unreadable_file", str(e)
-
+    with f:
+        try:
+            text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # empty file or non-mappable stream → plain read
+            text = f.read()
+        try:
+            return _parse_text(text, path)
+        finally:
+            if isinstance(text, mmap.mmap):
+                text.close()
+
+
+def _parse_text(text, path):
+    """Parse an in-memory (bytes-like) ChampSim log. See parse_one_file."""
     # ── Format detection (spec §4.1) ──────────────────────────────────────────
-    if _WP_SIG.search(text):
+    # Substring prefilter short-circuits the anchored regex when no WRONG-PATH
+    # line exists at all (every normal-format log). find() is used instead of
+    # `in` because mmap objects have no substring containment.
+    if text.find(b"WRONG-PATH") >= 0 and _WP_SIG.search(text):
         log_format = "wp_capable"
-    elif _NORM_SIG.search(text):
+    elif text.find(_NORM_SIG) >= 0:
         log_format = "normal"
     else:
         return None, "unknown_format", f"No recognizable format signature in {path}"
 
     # ── WP mode detection (spec §4.2) ─────────────────────────────────────────
-    wp_mode = "on" if _WP_MODE.search(text) else "off"
+    wp_mode = "on" if text.find(_WP_MODE) >= 0 else "off"
     wp_on   = (wp_mode == "on")
 
     # ── ROI – last occurrence (spec §5) ───────────────────────────────────────
@@ -560,44 +875,47 @@ def parse_one_file(path):
     if log_format == "wp_capable" and wp_cycles is None:
         warnings.append("missing_wp_cycles")
 
+    # ── Single pass over the text for all global fields ───────────────────────
+    # Every stats section follows the final ROI line in both formats, so the
+    # scan (and the per-level parsers below) start at its end rather than
+    # rescanning warmup/heartbeat output.
+    roi_end = m_roi.end()
+    hits = scan_all(text, roi_end)
+
     # ── G2 WP insts ───────────────────────────────────────────────────────────
-    m = WP_INSTS_RE.search(text)
-    wp_insts_total    = _getint(m, 1)
-    wp_insts_skipped  = _getint(m, 2)
-    wp_insts_executed = _getint(m, 3)
+    wp_insts_total    = _hit_int(hits, "wp_insts", 0)
+    wp_insts_skipped  = _hit_int(hits, "wp_insts", 1)
+    wp_insts_executed = _hit_int(hits, "wp_insts", 2)
 
-    m = FOOTPRINT_RE.search(text)
-    instr_footprint = _getint(m, 1)
-    data_footprint  = _getint(m, 2)
+    instr_footprint = _hit_int(hits, "footprint", 0)
+    data_footprint  = _hit_int(hits, "footprint", 1)
 
-    m = ISPF_RE.search(text)
-    is_prefetch_insts   = _getint(m, 1)
-    is_prefetch_skipped = _getint(m, 2)
+    is_prefetch_insts   = _hit_int(hits, "ispf", 0)
+    is_prefetch_skipped = _hit_int(hits, "ispf", 1)
 
     # ── G3 Branch ─────────────────────────────────────────────────────────────
-    m = BR_RE.search(text)
-    branch_acc_percent = _getfloat(m, 1)
-    branch_mpki        = _getfloat(m, 2)
+    branch_acc_percent = _hit_float(hits, "branch", 0)
+    branch_mpki        = _hit_float(hits, "branch", 1)
 
-    br_direct_jump_mpki    = _getfloat(BR_DJ_RE.search(text), 1)
-    br_indirect_mpki       = _getfloat(BR_I_RE.search(text),  1)
-    br_conditional_mpki    = _getfloat(BR_C_RE.search(text),  1)
-    br_direct_call_mpki    = _getfloat(BR_DC_RE.search(text), 1)
-    br_indirect_call_mpki  = _getfloat(BR_IC_RE.search(text), 1)
-    br_return_mpki         = _getfloat(BR_R_RE.search(text),  1)
+    br_direct_jump_mpki    = _hit_float(hits, "br_dj")
+    br_indirect_mpki       = _hit_float(hits, "br_i")
+    br_conditional_mpki    = _hit_float(hits, "br_c")
+    br_direct_call_mpki    = _hit_float(hits, "br_dc")
+    br_indirect_call_mpki  = _hit_float(hits, "br_ic")
+    br_return_mpki         = _hit_float(hits, "br_r")
 
     # ── G4 Pipeline / Execute stats (WP binary only) ──────────────────────────
     if log_format == "wp_capable":
-        exec_only_wp_cycles     = _getint(EXEC_WP_CYC_RE.search(text),  1)
-        exec_only_cp_cycles     = _getint(EXEC_CP_CYC_RE.search(text),  1)
-        exec_cp_wp_cycles       = _getint(EXEC_CPWP_RE.search(text),    1)
-        rob_full_cycles         = _getint(ROB_FULL_CYC_RE.search(text), 1)
-        rob_empty_cycles        = _getint(ROB_EMPTY_CYC_RE.search(text),1)
-        rob_full_events         = _getint(ROB_FULL_EVT_RE.search(text), 1)
-        rob_empty_events        = _getint(ROB_EMPTY_EVT_RE.search(text),1)
-        resteer_events          = _getint(RESTEER_EVT_RE.search(text),  1)
-        resteer_penalty_pct     = _getfloat(RESTEER_PCT_RE.search(text),1)
-        wp_not_avail_cycles_pct = _getfloat(WP_NA_PCT_RE.search(text), 1)
+        exec_only_wp_cycles     = _hit_int(hits, "exec_wp")
+        exec_only_cp_cycles     = _hit_int(hits, "exec_cp")
+        exec_cp_wp_cycles       = _hit_int(hits, "exec_cpwp")
+        rob_full_cycles         = _hit_int(hits, "rob_full_cyc")
+        rob_empty_cycles        = _hit_int(hits, "rob_empty_cyc")
+        rob_full_events         = _hit_int(hits, "rob_full_evt")
+        rob_empty_events        = _hit_int(hits, "rob_empty_evt")
+        resteer_events          = _hit_int(hits, "resteer_evt")
+        resteer_penalty_pct     = _hit_float(hits, "resteer_pct")
+        wp_not_avail_cycles_pct = _hit_float(hits, "wp_na")
     else:
         exec_only_wp_cycles     = None
         exec_only_cp_cycles     = None
@@ -611,19 +929,20 @@ def parse_one_file(path):
         wp_not_avail_cycles_pct = None
 
     # ── G5 Cache levels ───────────────────────────────────────────────────────
+    cache_pats = _CACHE_PATTERNS[log_format]
     cache_rows = {}
-    for lv in ["l1d", "l1i", "l2c", "llc"]:
-        cache_rows.update(parse_cache_level(text, lv, log_format, wp_on, inst))
+    for lv, pats in cache_pats.items():
+        cache_rows.update(parse_cache_level(text, lv, pats, wp_on, inst, roi_end))
 
     # ── G6 TLB levels ─────────────────────────────────────────────────────────
+    tlb_pats = _TLB_PATTERNS[log_format]
     tlb_rows = {}
-    for tlv in ["dtlb", "itlb", "stlb"]:
-        tlb_rows.update(parse_tlb_level(text, tlv, log_format, wp_on, inst))
+    for tlv, pats in tlb_pats.items():
+        tlb_rows.update(parse_tlb_level(text, tlv, pats, wp_on, inst, roi_end))
 
     # ── G7 DRAM ───────────────────────────────────────────────────────────────
-    m = DRAM_RE.search(text)
-    dram_rq_row_hit  = _getint(m, 1)
-    dram_rq_row_miss = _getint(m, 2)
+    dram_rq_row_hit  = _hit_int(hits, "dram", 0)
+    dram_rq_row_miss = _hit_int(hits, "dram", 1)
 
     # ── Assemble row ──────────────────────────────────────────────────────────
     row = {
@@ -672,33 +991,111 @@ def parse_one_file(path):
     return row, None, None
 
 
+def _parse_worker(path):
+    """Pool worker: parse one file, returning (path, result) for reassembly."""
+    return path, parse_one_file(path)
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main():
     args = parse_args()
-    label_map = build_label_map(args.label_map)
+    label_for = make_label_matcher(build_label_map(args.label_map))
     os.makedirs(args.outdir, exist_ok=True)
     img_formats = [s.strip().lower() for s in args.img_formats.split(",") if s.strip()]
 
-    rows = []
     error_rows = []
 
-    for path in sorted(glob.glob(args.glob)):
-        bench = bench_from_name(path)
-        cfg   = label_from_name(path, label_map)
-        rec, err_code, err_detail = parse_one_file(path)
-        if err_code:
-            error_rows.append({
-                "file": os.path.basename(path),
-                "bench": bench,
-                "config": cfg,
-                "error_code": err_code,
-                "detail": err_detail or "",
-            })
-            continue
-        row = {"bench": bench, "config": cfg, "file": os.path.basename(path)}
-        row.update(rec)
-        rows.append(row)
+    # Parsing is CPU-bound on regex execution and independent per file, so
+    # fan it out across cores. imap (ordered) yields results in sorted-path
+    # order while buffering only out-of-order completions, so rows can be
+    # streamed straight to disk instead of accumulating the whole sweep.
+    paths = find_log_paths(args.glob)
+
+    # full_metrics.csv / summary.csv (spec §6.1, §6.2)
+    # Column schema is auto-selected from the detected log formats (spec
+    # §9.2): any wp_capable row → full 183-column schema; all-normal →
+    # reduced 82-column schema. The choice is only settled once a
+    # wp_capable row shows up, so rows are buffered in `pending` until
+    # then (or until the sweep ends all-normal) and streamed afterwards.
+    # Cell values never contain commas or quotes (counts, floats,
+    # filenames, labels), so rows are emitted with a plain join instead of
+    # DictWriter's per-field dict rebuild and quoting logic.
+    full_path = os.path.join(args.outdir, "full_metrics.csv")
+    sum_path = os.path.join(args.outdir, "summary.csv")
+    full_f = sum_f = None
+    full_cols = sum_cols = None
+    pending = []
+    n_rows = 0
+
+    # Slim projection kept in memory for normalized_ipc.csv and the plots,
+    # as parallel columns rather than a dict per file.
+    slim_bench, slim_config, slim_ipc, slim_mpki = [], [], [], []
+
+    try:
+        if paths:
+            nproc = min(os.cpu_count() or 1, len(paths))
+            # ~4 chunks per worker balances dispatch overhead against
+            # stragglers (log sizes vary widely across benchmarks).
+            chunk = max(1, len(paths) // (4 * nproc))
+            with multiprocessing.Pool(nproc) as pool:
+                for path, res in pool.imap(_parse_worker, paths, chunksize=chunk):
+                    bench = bench_from_name(path)
+                    cfg   = label_for(path)
+                    rec, err_code, err_detail = res
+                    if err_code:
+                        error_rows.append({
+                            "file": os.path.basename(path),
+                            "bench": bench,
+                            "config": cfg,
+                            "error_code": err_code,
+                            "detail": err_detail or "",
+                        })
+                        continue
+                    row = {"bench": bench, "config": cfg, "file": os.path.basename(path)}
+                    row.update(rec)
+                    n_rows += 1
+                    slim_bench.append(bench)
+                    slim_config.append(cfg)
+                    slim_ipc.append(row.get("ipc"))
+                    slim_mpki.append(row.get("llc_load_mpki"))
+
+                    if full_f is None:
+                        pending.append(row)
+                        if row.get("log_format") == "wp_capable":
+                            full_cols = schema_columns(FULL_FIELDNAMES)
+                            sum_cols = schema_columns(SUMMARY_FIELDNAMES)
+                            # 1 MiB buffers: rows are written one join at
+                            # a time, so let the OS see large writes.
+                            full_f = open(full_path, "w", newline="", buffering=1 << 20)
+                            sum_f = open(sum_path, "w", newline="", buffering=1 << 20)
+                            full_f.write(",".join(FULL_FIELDNAMES) + "\r\n")
+                            sum_f.write(",".join(SUMMARY_FIELDNAMES) + "\r\n")
+                            for r in pending:
+                                write_csv_row(full_f, full_cols, r)
+                                write_csv_row(sum_f, sum_cols, r)
+                            pending = []
+                    else:
+                        write_csv_row(full_f, full_cols, row)
+                        write_csv_row(sum_f, sum_cols, row)
+
+        # All-normal sweep: the schema was never forced to full, flush now.
+        if pending:
+            full_f = open(full_path, "w", newline="", buffering=1 << 20)
+            sum_f = open(sum_path, "w", newline="", buffering=1 << 20)
+            full_f.write(",".join(NORMAL_FIELDNAMES) + "\r\n")
+            sum_f.write(",".join(NORMAL_SUMMARY_FIELDNAMES) + "\r\n")
+            full_cols = schema_columns(NORMAL_FIELDNAMES)
+            sum_cols = schema_columns(NORMAL_SUMMARY_FIELDNAMES)
+            for r in pending:
+                write_csv_row(full_f, full_cols, r)
+                write_csv_row(sum_f, sum_cols, r)
+            pending = []
+    finally:
+        if full_f is not None:
+            full_f.close()
+        if sum_f is not None:
+            sum_f.close()
 
     # parse_errors.csv (spec §11.2)
     if error_rows:
@@ -709,42 +1106,20 @@ def main():
             w.writerows(error_rows)
         print(err_path)
 
-    if not rows:
+    if not n_rows:
         print("No rows parsed. Check --glob and log files.")
         for e in error_rows[:20]:
             print(f"  ERROR [{e['error_code']}] {e['file']}: {e['detail']}")
         return
 
-    # Auto-select column schema based on detected log formats (spec §9.2)
-    # If any row is wp_capable → full 183-column schema
-    # If all rows are normal  → reduced 82-column schema (WP-only columns omitted)
-    has_wp = any(r.get("log_format") == "wp_capable" for r in rows)
-    full_fields = FULL_FIELDNAMES if has_wp else NORMAL_FIELDNAMES
-    sum_fields  = SUMMARY_FIELDNAMES if has_wp else NORMAL_SUMMARY_FIELDNAMES
-
-    # full_metrics.csv (spec §6.1)
-    full_path = os.path.join(args.outdir, "full_metrics.csv")
-    with open(full_path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=full_fields, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: fmt(r.get(k), k) for k in full_fields})
     print(full_path)
-
-    # summary.csv (spec §6.2)
-    sum_path = os.path.join(args.outdir, "summary.csv")
-    with open(sum_path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=sum_fields, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: fmt(r.get(k), k) for k in sum_fields})
     print(sum_path)
 
     # normalized_ipc.csv (legacy feature, spec §6.3)
     baseline_label = args.baseline
     bybench = defaultdict(dict)
-    for r in rows:
-        bybench[r["bench"]][r["config"]] = r.get("ipc")
+    for b, c, v in zip(slim_bench, slim_config, slim_ipc):
+        bybench[b][c] = v
 
     norm_rows = []
     ratios_by_cfg = defaultdict(list)
@@ -782,68 +1157,68 @@ def main():
         print("matplotlib not available; skipping plots:", e)
         return
 
-    # Plot 1: Normalized IPC bar
+    # Plot 1: Normalized IPC bar.  The ratios are still in memory in
+    # norm_rows, so build the plot input from those instead of re-reading
+    # and re-parsing normalized_ipc.csv.
+    norm_key = "ipc_norm_vs_" + baseline_label
     norm_data = defaultdict(dict)
-    with open(norm_path) as f:
-        for row in csv.DictReader(f):
-            if row["bench"] == "__geomean__":
-                continue
-            k = next((k for k in row.keys() if k.startswith("ipc_norm_vs_")), None)
-            if not k:
-                continue
-            v = row.get(k)
-            if not v or v == "None":
-                continue
-            norm_data[row["bench"]][row["config"]] = float(v)
+    for row in norm_rows:
+        if row["bench"] == "__geomean__":
+            continue
+        v = row.get(norm_key)
+        if v is None:
+            continue
+        norm_data[row["bench"]][row["config"]] = v
 
     benches = sorted(norm_data.keys())
     if benches:
         configs = sorted({c for d in norm_data.values() for c in d.keys()})
         width = 0.8 / len(configs) if configs else 0.8
         xs = list(range(len(benches)))
-        plt.figure()
+        # Explicit Figure/Axes: the figure is laid out once and saved per
+        # format from the same render state, instead of going through
+        # pyplot's implicit current-figure machinery.
+        fig, ax = plt.subplots()
         for i, cfg in enumerate(configs):
             ys = [norm_data[b].get(cfg, 0.0) for b in benches]
-            plt.bar([x + i * width for x in xs], ys, width=width, label=cfg)
-        plt.axhline(1.0, linestyle="--", linewidth=1)
-        plt.xticks([x + 0.4 for x in xs], benches, rotation=45, ha="right")
-        plt.ylabel("IPC normalized to " + baseline_label)
-        plt.legend()
-        plt.tight_layout()
+            ax.bar([x + i * width for x in xs], ys, width=width, label=cfg)
+        ax.axhline(1.0, linestyle="--", linewidth=1)
+        ax.set_xticks([x + 0.4 for x in xs])
+        ax.set_xticklabels(benches, rotation=45, ha="right")
+        ax.set_ylabel("IPC normalized to " + baseline_label)
+        ax.legend()
+        fig.tight_layout()
         for ext in img_formats:
             outpath = os.path.join(args.outdir, f"ipc_normalized_bar.{ext}")
-            plt.savefig(outpath, dpi=180)
+            fig.savefig(outpath, dpi=180)
             print(outpath)
-        plt.close()
-
-    # Plot 2: IPC vs LLC MPKI scatter
-    plt.figure()
+        plt.close(fig)
+
+    # Plot 2: IPC vs LLC MPKI scatter.  Group the points per config in a
+    # single pass over rows rather than rescanning the list once per config.
+    scatter_data = defaultdict(lambda: ([], []))
+    for c, x, y in zip(slim_config, slim_mpki, slim_ipc):
+        if x is not None and y is not None:
+            xs2, ys2 = scatter_data[c]
+            xs2.append(x)
+            ys2.append(y)
+    fig, ax = plt.subplots()
     have_any = False
-    for cfg in sorted({r["config"] for r in rows}):
-        xs2, ys2 = [], []
-        for r in rows:
-            if r["config"] != cfg:
-                continue
-            x = r.get("llc_load_mpki")
-            y = r.get("ipc")
-            if x is not None and y is not None:
-                xs2.append(float(x) if isinstance(x, float) else x)
-                ys2.append(float(y) if isinstance(y, float) else y)
+    for cfg in sorted(scatter_data):
+        xs2, ys2 = scatter_data[cfg]
         if xs2 and ys2:
-            plt.scatter(xs2, ys2, label=cfg, alpha=0.7)
+            ax.scatter(xs2, ys2, label=cfg, alpha=0.7)
             have_any = True
     if have_any:
-        plt.xlabel("LLC load MPKI")
-        plt.ylabel("IPC")
-        plt.legend()
-        plt.tight_layout()
+        ax.set_xlabel("LLC load MPKI")
+        ax.set_ylabel("IPC")
+        ax.legend()
+        fig.tight_layout()
         for ext in img_formats:
             outpath = os.path.join(args.outdir, f"ipc_vs_llc_mpki.{ext}")
-            plt.savefig(outpath, dpi=180)
+            fig.savefig(outpath, dpi=180)
             print(outpath)
-        plt.close()
-    else:
-        plt.close()
+    plt.close(fig)
 
 
 if __name__ == "__main__":
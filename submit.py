@@ -12,34 +12,88 @@ Debug output:
 - runs/<run>/results/summary_out/e2e_stdout.txt (auto/inline summarize)
 """
 
-import argparse, os, sys, glob, datetime, subprocess, shlex, re, time
+import argparse, os, sys, glob, fnmatch, datetime, subprocess, shlex, re, time, hashlib, pickle, atexit, io, random, json, functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+_JID_RE = re.compile(r"Submitted batch job (\d+)")
+
 # -----------------------
 # Debug helpers
 # -----------------------
-def append_log(log_path, msg):
-    ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_path, "a") as f:
-        f.write(f"[{ts}] {msg}\n")
+class DebugLogger:
+    """Line-buffered append handle for a debug log, opened once per path."""
+
+    def __init__(self, path):
+        self.f = open(path, "a", buffering=1)
+
+    def log(self, msg):
+        self.f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
+
+    def close(self):
+        self.f.close()
+
+_loggers = {}
 
-def run_capture(cmd, check=False, cwd=None, env=None):
+def append_log(log_path, msg):
+    # Reuse one buffered fd per log path instead of open/write/close
+    # per line; a chunked submit logs several lines per sbatch call.
+    lg = _loggers.get(log_path)
+    if lg is None:
+        lg = _loggers[log_path] = DebugLogger(log_path)
+    lg.log(msg)
+
+@atexit.register
+def _close_loggers():
+    for lg in _loggers.values():
+        lg.close()
+
+def run_capture(cmd, check=False, cwd=None, env=None, log_prefix=None, debug_log=None):
     """
     Python 3.6互換: text= は使わず universal_newlines=True
     return: (stdout, returncode)
+    With log_prefix, stream stdout to the debug log line by line as it
+    arrives instead of escaping the captured blob afterwards.
     """
-    p = subprocess.run(
+    # close_fds=False lets CPython use posix_spawn instead of
+    # fork+exec on Linux, skipping the page-table copy of this process;
+    # nothing here opens inheritable fds the children must not see.
+    if log_prefix is None:
+        p = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            cwd=cwd,
+            env=env,
+            close_fds=False,
+        )
+        if check and p.returncode != 0:
+            raise subprocess.CalledProcessError(p.returncode, cmd, output=p.stdout)
+        return p.stdout, p.returncode
+
+    p = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         universal_newlines=True,
         cwd=cwd,
         env=env,
+        close_fds=False,
     )
-    if check and p.returncode != 0:
-        raise subprocess.CalledProcessError(p.returncode, cmd, output=p.stdout)
-    return p.stdout, p.returncode
-
+    buf = io.StringIO()
+    for line in iter(p.stdout.readline, ""):
+        buf.write(line)
+        if debug_log:
+            append_log(debug_log, log_prefix + line.rstrip("\n"))
+    p.stdout.close()
+    rc = p.wait()
+    out = buf.getvalue()
+    if check and rc != 0:
+        raise subprocess.CalledProcessError(rc, cmd, output=out)
+    return out, rc
+
+@functools.lru_cache(maxsize=1)
 def choose_python_exe():
     """
     summarize 実行時に使う python を選ぶ。
@@ -58,29 +112,114 @@ def choose_python_exe():
 # Core logic
 # -----------------------
 def load_yaml(path):
+    # JSON is valid YAML, but json.load is a C extension and needs no
+    # PyYAML at all; recipes named *.json take that path directly (fast
+    # enough that the pickle cache below would only add overhead).
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            return json.load(f)
+
     try:
         import yaml
     except ImportError:
         print("Please install PyYAML: pip install --user pyyaml", file=sys.stderr)
         sys.exit(1)
+
+    # The same recipe is parsed on every submit; keep the parsed dict
+    # pickled under ~/.cache keyed on the recipe path, valid while the
+    # cache file is newer than the recipe. Cache failures just re-parse.
+    real = os.path.realpath(path)
+    cache_dir = Path.home() / ".cache" / "runner_champsim"
+    cache = cache_dir / (hashlib.sha1(real.encode()).hexdigest() + ".pkl")
+    try:
+        if cache.stat().st_mtime >= os.stat(real).st_mtime:
+            with cache.open("rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        pass
+
+    # CSafeLoader (libyaml bindings) parses ~10x faster than the pure-
+    # Python SafeLoader with identical safe_load semantics; not every
+    # PyYAML build ships it.
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeLoader as _Loader
+
     with open(path, "r") as f:
-        return yaml.safe_load(f)
+        spec = yaml.load(f, Loader=_Loader)
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(cache.name + f".tmp.{os.getpid()}")
+        with tmp.open("wb") as f:
+            pickle.dump(spec, f)
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    return spec
+
+def _scan_dir(dirpart):
+    """List a directory once; None when it cannot be read."""
+    try:
+        with os.scandir(dirpart or ".") as it:
+            return list(it)
+    except OSError:
+        return None
+
+def _match_listing(entries, name):
+    """Match a filename pattern against cached DirEntry objects.
+
+    Returns (regular files, matched anything). is_file() reuses the
+    getdents metadata, so only matched names cost anything extra.
+    """
+    hidden_ok = name.startswith(".")
+    files, matched = [], False
+    for e in entries:
+        if not hidden_ok and e.name.startswith("."):
+            continue
+        if fnmatch.fnmatchcase(e.name, name):
+            matched = True
+            if e.is_file():
+                files.append(e.path)
+    files.sort()
+    return files, matched
+
+def _expand_glob(pat):
+    """glob fallback for patterns with wildcards in the directory part."""
+    matches = sorted(glob.glob(pat))
+    return [p for p in matches if os.path.isfile(p)], bool(matches)
 
 def expand_traces(patterns):
+    # Expand in a thread pool: on Lustre/GPFS every stat is a
+    # metadata-server round trip, so serial expansion dominates startup
+    # for large trace lists. Patterns whose wildcard sits in the filename
+    # share one scandir per parent directory (several extensions globbed
+    # from the same traces dir is the common layout); only patterns with
+    # wildcards in the directory part fall back to glob. Results are
+    # indexed by pattern to keep the original ordering.
+    split = [os.path.split(p) for p in patterns]
+    simple = [glob.has_magic(n) and not glob.has_magic(d) for d, n in split]
+    scan_dirs = sorted({d for (d, _), s in zip(split, simple) if s})
+    glob_pats = [p for p, s in zip(patterns, simple) if not s]
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        listings = dict(zip(scan_dirs, ex.map(_scan_dir, scan_dirs)))
+        globbed = dict(zip(glob_pats, ex.map(_expand_glob, glob_pats)))
+
     out = []
-    for pat in patterns:
-        matches = sorted(glob.glob(pat))
-        if matches:
-            out.extend(os.path.abspath(p) for p in matches if os.path.isfile(p))
+    for pat, (dirpart, name), is_simple in zip(patterns, split, simple):
+        if is_simple:
+            entries = listings[dirpart]
+            files, matched = ([], False) if entries is None else _match_listing(entries, name)
+        else:
+            files, matched = globbed[pat]
+        if matched:
+            out.extend(os.path.abspath(p) for p in files)
         elif os.path.isfile(pat):
             out.append(os.path.abspath(pat))
         else:
             print(f"WARN: no matches for {pat}", file=sys.stderr)
-    seen, uniq = set(), []
-    for p in out:
-        if p not in seen:
-            uniq.append(p); seen.add(p)
-    return uniq
+    return list(dict.fromkeys(out))
 
 def expand_trace_configs(trace_configs):
     """
@@ -103,20 +242,35 @@ def expand_trace_configs(trace_configs):
             pairs.append((t, args))
     return pairs
 
+def _require_paths(paths, pred, what):
+    # Stat candidates across a thread pool (same rationale as
+    # expand_traces) and exit on the first miss, reported in input order.
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        for p, ok in zip(paths, ex.map(pred, paths)):
+            if not ok:
+                sys.exit(f"{what} not found: {p}")
+
 def write_matrix(run_dir, bins, traces, argsets):
     mpath = Path(run_dir) / "matrix.tsv"
-    arg_index = {a: i for i, a in enumerate(argsets)}
-    with mpath.open("w") as f:
+
+    # Validate each path once up front; the old innermost-loop checks
+    # re-stated every binary per trace per argset.
+    _require_paths(traces, os.path.exists, "Trace")
+    _require_paths(bins, os.path.isfile, "Binary")
+
+    # The argset suffix of a row never varies with trace or binary, so
+    # format it once and assemble rows by concatenation: one writelines
+    # per trace instead of a per-row f-string over the whole matrix.
+    suffixes = [f"\t{a}\t{i}\n" for i, a in enumerate(argsets)]
+    # Write via a sibling tmp file and rename: os.replace is atomic on
+    # POSIX, so array tasks re-reading matrix.tsv never see a torn file.
+    tmp = mpath.with_suffix(".tsv.tmp")
+    with open(tmp, "w", buffering=1 << 20) as f:
         for t in traces:
-            if not os.path.exists(t):
-                sys.exit(f"Trace not found: {t}")
-            for b in bins:
-                if not os.path.isfile(b):
-                    sys.exit(f"Binary not found: {b}")
-                for a in argsets:
-                    idx = arg_index[a]
-                    f.write(f"{b}\t{t}\t{a}\t{idx}\n")
-    return str(mpath)
+            mid = "\t" + t
+            f.writelines(b + mid + s for b in bins for s in suffixes)
+    os.replace(tmp, mpath)
+    return str(mpath), len(bins) * len(traces) * len(argsets)
 
 def write_matrix_from_pairs(run_dir, bins, trace_args_pairs):
     """
@@ -124,25 +278,27 @@ def write_matrix_from_pairs(run_dir, bins, trace_args_pairs):
     Each trace has its own associated args.
     """
     mpath = Path(run_dir) / "matrix.tsv"
-    # Create unique list of args and index them
-    unique_args = []
-    seen_args = set()
-    for _, args in trace_args_pairs:
-        if args not in seen_args:
-            unique_args.append(args)
-            seen_args.add(args)
-    arg_index = {a: i for i, a in enumerate(unique_args)}
-
-    with mpath.open("w") as f:
-        for t, args in trace_args_pairs:
-            if not os.path.exists(t):
-                sys.exit(f"Trace not found: {t}")
-            for b in bins:
-                if not os.path.isfile(b):
-                    sys.exit(f"Binary not found: {b}")
-                idx = arg_index[args]
-                f.write(f"{b}\t{t}\t{args}\t{idx}\n")
-    return str(mpath)
+
+    # Validate once per distinct path (a trace may appear in several
+    # pairs), then emit the whole TSV in one write.
+    _require_paths(dict.fromkeys(t for t, _ in trace_args_pairs),
+                   os.path.exists, "Trace")
+    _require_paths(bins, os.path.isfile, "Binary")
+
+    # setdefault assigns each distinct argset its first-seen index, so
+    # no separate unique_args/seen_args pass is needed.
+    arg_index = {}
+    rows = [
+        f"{b}\t{t}\t{args}\t{arg_index.setdefault(args, len(arg_index))}"
+        for t, args in trace_args_pairs
+        for b in bins
+    ]
+    # Write via a sibling tmp file and rename: os.replace is atomic on
+    # POSIX, so array tasks re-reading matrix.tsv never see a torn file.
+    tmp = mpath.with_suffix(".tsv.tmp")
+    tmp.write_text("\n".join(rows) + "\n" if rows else "")
+    os.replace(tmp, mpath)
+    return str(mpath), len(rows)
 
 def sbatch_common_prefix(res):
     part = res.get("partition")
@@ -169,67 +325,192 @@ def sbatch_common_prefix(res):
 
     return cmd
 
+def probe_max_array_size(debug_log=None):
+    """
+    Query the cluster's MaxArraySize once via scontrol.
+    Returns int, or None when scontrol is unavailable / the field is absent.
+    """
+    out, rc = run_capture(["scontrol", "show", "config"], check=False)
+    if rc != 0:
+        if debug_log:
+            append_log(debug_log, f"scontrol_show_config_rc={rc} (MaxArraySize unknown)")
+        return None
+    m = re.search(r"MaxArraySize\s*=\s*(\d+)", out)
+    return int(m.group(1)) if m else None
+
 def submit_in_chunks(run_dir, name, total, res, jobfile, debug_log=None):
     chunk = int(res.get("chunk", 1000))
     tim  = res.get("time", "08:00:00")
     mem  = res.get("mem", "8G")
     cpus = int(res.get("cpus_per_task", 1))
+    # max_concurrent is the name this knob goes by in Slurm docs
+    # (--array %N); accept it as an alias of throttle.
+    throttle = res.get("throttle") or res.get("max_concurrent")
+
+    # One sbatch RPC for the whole matrix when the site's MaxArraySize
+    # allows it (array indices must stay below that limit); chunked
+    # submission is only the fallback. With many chunks each sbatch fork +
+    # controller RPC costs seconds, so this is the difference between one
+    # call and dozens. An optional resources.throttle becomes %N so a huge
+    # array does not flood the partition.
+    max_array = probe_max_array_size(debug_log=debug_log)
+    if max_array and total <= max_array:
+        chunk = total
+    if debug_log:
+        append_log(debug_log, f"max_array_size={max_array} chunk={chunk} throttle={throttle}")
 
     sbatch_log = Path(run_dir) / "sbatch_cmd.txt"
     jobs_log   = Path(run_dir) / "sbatch_jobs.txt"
     job_ids    = []
 
-    with sbatch_log.open("w") as wf, jobs_log.open("w") as jf:
-        piece = 0
-        for start in range(0, total, chunk):
-            end = min(start + chunk, total) - 1
-            jname = f"{name}_p{piece}" if total > chunk else name
-
-            cmd = sbatch_common_prefix(res)
-            cmd += [
-                f"--array={start}-{end}",
-                f"--time={tim}",
-                f"--mem={mem}",
-                f"--cpus-per-task={cpus}",
-                f"--job-name={jname}",
-                f"--chdir={run_dir}",
-                str(jobfile),
-            ]
-
-            line = " ".join(shlex.quote(x) for x in cmd)
-            print("submit:", line)
-            wf.write(line + "\n")
-            if debug_log:
-                append_log(debug_log, f"sbatch_cmd: {line}")
-
-            try:
-                out, rc = run_capture(cmd, check=True)
-            except subprocess.CalledProcessError as e:
-                out = getattr(e, "output", "") or ""
+    # Same prefix (partition/qos/account/export) for every chunk; build
+    # it once instead of re-reading res and the environment per piece.
+    prefix = sbatch_common_prefix(res)
+
+    # Each chunk is an independent sbatch call (a fork plus a slurmctld
+    # RPC), so when MaxArraySize forces several of them, overlap the
+    # calls with a small thread pool. Results are consumed in submission
+    # order, keeping job_ids and sbatch_jobs.txt ordering unchanged.
+    # Only --array and --job-name vary between chunks; quote the constant
+    # parts of the printable command line once instead of re-running
+    # shlex.quote over every element per chunk.
+    tail = [
+        f"--time={tim}",
+        f"--mem={mem}",
+        f"--cpus-per-task={cpus}",
+    ]
+    end_args = [f"--chdir={run_dir}", str(jobfile)]
+    q_prefix = " ".join(shlex.quote(x) for x in prefix)
+    q_tail = " ".join(shlex.quote(x) for x in tail)
+    q_end = " ".join(shlex.quote(x) for x in end_args)
+
+    cmds, lines = [], []
+    piece = 0
+    for start in range(0, total, chunk):
+        end = min(start + chunk, total) - 1
+        jname = f"{name}_p{piece}" if total > chunk else name
+
+        array_spec = f"{start}-{end}"
+        if throttle:
+            array_spec += f"%{int(throttle)}"
+
+        array_arg = f"--array={array_spec}"
+        jname_arg = f"--job-name={jname}"
+        cmds.append(list(prefix) + [array_arg] + tail + [jname_arg] + end_args)
+        lines.append(f"{q_prefix} {shlex.quote(array_arg)} {q_tail} "
+                     f"{shlex.quote(jname_arg)} {q_end}")
+        piece += 1
+
+    def _submit(cmd):
+        try:
+            out, rc = run_capture(cmd, check=True,
+                                  log_prefix="sbatch_out: ", debug_log=debug_log)
+            return out, rc, None
+        except subprocess.CalledProcessError as e:
+            return (getattr(e, "output", "") or ""), e.returncode, e
+
+    for line in lines:
+        print("submit:", line)
+        if debug_log:
+            append_log(debug_log, f"sbatch_cmd: {line}")
+    with sbatch_log.open("w") as wf:
+        wf.writelines(line + "\n" for line in lines)
+
+    # resources.max_submit_rate caps in-flight sbatch calls below the
+    # site's AssocMaxSubmitJobLimit; each worker runs one call at a
+    # time, so bounding the pool bounds the rate.
+    workers = min(8, len(cmds))
+    max_rate = res.get("max_submit_rate")
+    if max_rate:
+        workers = min(workers, int(max_rate))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(_submit, cmds))
+
+    # All chunks were already submitted by the pool, so walk every
+    # result — collecting ids and logging failures — before raising;
+    # otherwise the arrays of chunks after the first failure would be
+    # left running with their ids recorded nowhere. The finally then
+    # puts every submitted id in sbatch_jobs.txt, so the partial run
+    # can still be waited on or scancel'"'"'d.
+    first_err = None
+    try:
+        for out, rc, err in results:
+            if err is not None:
                 if debug_log:
-                    append_log(debug_log, f"sbatch_failed_rc={e.returncode}")
-                    append_log(debug_log, "sbatch_failed_out: " + out.strip().replace("\n", "\\n"))
+                    append_log(debug_log, f"sbatch_failed_rc={rc}")
                 print(out.strip())
-                raise
+                if first_err is None:
+                    first_err = err
+                continue
 
             print(out.strip())
             if debug_log:
                 append_log(debug_log, f"sbatch_rc={rc}")
-                append_log(debug_log, "sbatch_out: " + out.strip().replace("\n", "\\n"))
 
-            m = re.search(r"Submitted batch job (\d+)", out)
+            m = _JID_RE.search(out)
             if m:
-                jid = m.group(1)
-                job_ids.append(jid)
-                jf.write(jid + "\n")
+                job_ids.append(m.group(1))
             else:
                 print("WARN: Could not retrieve job ID", file=sys.stderr)
                 if debug_log:
                     append_log(debug_log, "WARN: could not parse job id from sbatch output")
-            piece += 1
+        if first_err is not None:
+            raise first_err
+    finally:
+        with jobs_log.open("w") as jf:
+            jf.writelines(j + "\n" for j in job_ids)
 
     return job_ids
 
+# Allowlist of still-active sacct states; anything else (COMPLETED,
+# FAILED, CANCELLED, TIMEOUT, PREEMPTED, BOOT_FAIL, DEADLINE, REVOKED,
+# and whatever Slurm adds next) counts as terminal. A blocklist here
+# pins the wait forever when a job ends in a state it does not list.
+_SACCT_ACTIVE = ("PENDING", "RUNNING", "SUSPENDED", "COMPLETING",
+                 "CONFIGURING", "REQUEUED", "RESIZING")
+
+def _poll_active(pending, debug_log=None):
+    """
+    Return the subset of pending job ids still active, or None when
+    neither scheduler interface could answer this round.
+    """
+    ids = ",".join(sorted(pending))
+    out, rc = run_capture(
+        ["squeue", "-h", "-o", "%F", "-j", ids, "-t", "PD,R,CF,CG,S,RQ"],
+        check=False,
+    )
+    if rc == 0:
+        return pending & set(out.split())
+    if debug_log:
+        safe_out = out.strip().replace("\n", "\\n")
+        append_log(debug_log, f"squeue_rc={rc} out={safe_out}")
+
+    # squeue errors e.g. when every queried job has aged out of the
+    # controller ("Invalid job id specified"); ask slurmdbd instead,
+    # which keeps finished jobs, and drop ids in a terminal state.
+    out, rc = run_capture(
+        ["sacct", "-X", "-j", ids, "-o", "JobID,State",
+         "--parsable2", "--noheader"],
+        check=False,
+    )
+    if rc != 0:
+        if debug_log:
+            append_log(debug_log, f"sacct_rc={rc} (retrying)")
+        return None
+    # sacct -X reports one row per array task ("9001_0|COMPLETED"), not
+    # the parent id sbatch handed back; fold each row onto its parent
+    # and retire a parent only when every reported task is terminal.
+    seen, busy = set(), set()
+    for line in out.splitlines():
+        parts = line.split("|")
+        if len(parts) < 2:
+            continue
+        parent = parts[0].split("_", 1)[0]
+        seen.add(parent)
+        if parts[1].startswith(_SACCT_ACTIVE):
+            busy.add(parent)
+    return {j for j in pending if j not in seen or j in busy}
+
 def wait_for_jobs(job_ids, poll_sec=15, debug_log=None):
     if not job_ids:
         return
@@ -238,19 +519,34 @@ def wait_for_jobs(job_ids, poll_sec=15, debug_log=None):
     if debug_log:
         append_log(debug_log, msg)
 
+    # Poll with -h (no header) and a bare %F format (the array parent id,
+    # which is what sbatch handed back) so output is just ids and "no
+    # jobs left" is exactly the empty set. The -t filter limits output to
+    # non-terminal states so finished jobs drop out immediately. Jobs are
+    # removed from the pending set as they disappear, shrinking each
+    # successive query. Each probe is a fork + slurmctld RPC, so back off
+    # toward 2 minutes over the lifetime of a multi-hour sweep.
+    # (scontrol wait_job is not a substitute here: it returns when a job
+    # starts, not when it finishes.)
+    pending = set(job_ids)
+    delay = poll_sec
     while True:
-        out, rc = run_capture(["squeue", "-j", ",".join(job_ids)], check=False)
-        if debug_log and rc != 0:
-            safe_out = out.strip().replace("\n", "\\n")
-            append_log(debug_log, f"squeue_rc={rc} out={safe_out}")
-
-        lines = [ln for ln in out.splitlines() if ln.strip()]
-        if len(lines) <= 1:
-            print("All jobs finished.")
-            if debug_log:
-                append_log(debug_log, "All jobs finished.")
-            return
-        time.sleep(poll_sec)
+        remaining = _poll_active(pending, debug_log=debug_log)
+        if remaining is not None:
+            if not remaining:
+                print("All jobs finished.")
+                if debug_log:
+                    append_log(debug_log, "All jobs finished.")
+                return
+            if len(remaining) < len(pending):
+                # Progress: more completions are likely soon, so resume
+                # polling at the base interval.
+                delay = poll_sec
+            pending = remaining
+        # +/-20% jitter keeps many concurrent submit.py processes from
+        # synchronizing their squeue calls against the controller.
+        time.sleep(delay * random.uniform(0.8, 1.2))
+        delay = min(delay * 1.5, 120)
 
 def summarize_this_run(repo_root, run_dir, baseline="latest",
                        label_map="resche2:schedcost_on,resche_:schedcost_off,ChampSim:latest",
@@ -279,28 +575,41 @@ def summarize_this_run(repo_root, run_dir, baseline="latest",
     d(f"[summarize] CSIM_VENV={os.environ.get('CSIM_VENV','')}")
     d(f"[summarize] python_exe={choose_python_exe()}")
 
-    txts = sorted(res_dir.glob("*.txt"))
-    d(f"[summarize] txt_count={len(txts)}")
-    for p in txts[:30]:
+    # One scandir pass instead of glob + per-file stat: the entries carry
+    # a cached stat_result, so the preview below costs no extra syscalls.
+    with os.scandir(res_dir) as it:
+        txt_entries = sorted(
+            (e for e in it if e.name.endswith(".txt")), key=lambda e: e.name
+        )
+    d(f"[summarize] txt_count={len(txt_entries)}")
+    for ent in txt_entries[:30]:
         try:
-            d(f"[summarize] txt: {p.name} size={p.stat().st_size}")
+            d(f"[summarize] txt: {ent.name} size={ent.stat().st_size}")
         except Exception as e:
-            d(f"[summarize] WARN: stat fail {p.name}: {e}")
+            d(f"[summarize] WARN: stat fail {ent.name}: {e}")
 
-    if not txts:
+    if not txt_entries:
         d("[summarize] SKIP: no .txt in results/")
         print(f"[summarize] skip: {res_dir} (no .txt)")
         return
 
-    roi_hits = 0
-    for p in txts[:30]:
-        try:
-            s = p.read_text(errors="ignore")
-            if "cumulative IPC" in s:
-                roi_hits += 1
-        except Exception as e:
-            d(f"[summarize] WARN: read fail {p.name}: {e}")
-    d(f"[summarize] roi_hits_in_first30={roi_hits}")
+    # Reading 30 files of unknown size just for a debug line is pure
+    # overhead on the summarize path; opt in via CSIM_DEBUG_ROI, and cap
+    # each read at 64 KB so a stray huge log cannot stall it.
+    if os.environ.get("CSIM_DEBUG_ROI"):
+        roi_hits = 0
+        for ent in txt_entries[:30]:
+            try:
+                with open(ent.path, errors="ignore") as f:
+                    if "cumulative IPC" in f.read(65536):
+                        roi_hits += 1
+                        if roi_hits >= 3:
+                            # Three hits is evidence enough that the run
+                            # produced ROI stats; stop probing.
+                            break
+            except Exception as e:
+                d(f"[summarize] WARN: read fail {ent.name}: {e}")
+        d(f"[summarize] roi_hits_in_first30={roi_hits}")
 
     pyexe = choose_python_exe()
     cmd = [
@@ -328,21 +637,13 @@ def summarize_this_run(repo_root, run_dir, baseline="latest",
     d("[summarize] DONE")
     print(f"[summarize] wrote under: {out_dir}")
 
-def write_summarize_sbatch(runner_root, run_dir, baseline, label_map, img_formats):
+def summarize_shell_body(runner_root, run_dir, baseline, label_map, img_formats):
     """
-    Write sbatch script for summarize job with afterok dependency to run_dir
+    Shell body of the summarize job, shared by sbatch --wrap and the
+    --debug-keep-script file.
     """
-    path = Path(run_dir) / "summarize_afterok.sbatch"
     # Enable venv in bash with same priority as champsim_matrix.sbatch
-    script = f"""#!/bin/bash
-#SBATCH --job-name=csim_summarize
-#SBATCH --output=logs/summarize.%j.out
-#SBATCH --error=logs/summarize.%j.err
-#SBATCH --time=00:30:00
-#SBATCH --mem=2G
-#SBATCH --cpus-per-task=1
-
-set -euo pipefail
+    return f"""set -euo pipefail
 
 RUN_DIR="{run_dir}"
 RUNNER_ROOT="{runner_root}"
@@ -384,6 +685,21 @@ cd "$RUN_DIR"
   --img-formats "{img_formats}" \\
   2>&1 | tee "$RUN_DIR/results/summary_out/e2e_stdout.txt"
 """
+
+def write_summarize_sbatch(runner_root, run_dir, baseline, label_map, img_formats):
+    """
+    Write sbatch script for summarize job to run_dir (--debug-keep-script)
+    """
+    path = Path(run_dir) / "summarize_afterok.sbatch"
+    script = """#!/bin/bash
+#SBATCH --job-name=csim_summarize
+#SBATCH --output=logs/summarize.%j.out
+#SBATCH --error=logs/summarize.%j.err
+#SBATCH --time=00:30:00
+#SBATCH --mem=2G
+#SBATCH --cpus-per-task=1
+
+""" + summarize_shell_body(runner_root, run_dir, baseline, label_map, img_formats)
     path.write_text(script)
     # Set executable permission just in case
     try:
@@ -392,13 +708,23 @@ cd "$RUN_DIR"
         pass
     return str(path)
 
-def submit_summarize_job(run_dir, res, dep_job_ids, summarize_sbatch, debug_log=None):
+def submit_summarize_job(run_dir, res, dep_job_ids, shell_body, debug_log=None):
+    # Submit via --wrap so no script file has to be written and chmod'ed
+    # per run; Slurm stages the wrap body into a script server-side.
     dep = "afterok:" + ":".join(dep_job_ids)
     cmd = sbatch_common_prefix(res)
     cmd += [
+        "--job-name=csim_summarize",
+        "--output=logs/summarize.%j.out",
+        "--error=logs/summarize.%j.err",
+        "--time=00:30:00",
+        "--mem=2G",
+        "--cpus-per-task=1",
         f"--dependency={dep}",
         f"--chdir={run_dir}",
-        summarize_sbatch,
+        # --wrap runs under /bin/sh, but the body is bash (pipefail,
+        # [[ ]], source); exec an explicit bash so dash sites work.
+        f"--wrap=exec /bin/bash -c {shlex.quote(shell_body)}",
     ]
     line = " ".join(shlex.quote(x) for x in cmd)
     if debug_log:
@@ -407,7 +733,7 @@ def submit_summarize_job(run_dir, res, dep_job_ids, summarize_sbatch, debug_log=
     if debug_log:
         append_log(debug_log, f"summarize_sbatch_rc={rc}")
         append_log(debug_log, "summarize_sbatch_out: " + out.strip().replace("\n", "\\n"))
-    m = re.search(r"Submitted batch job (\d+)", out)
+    m = _JID_RE.search(out)
     return m.group(1) if m else None
 
 def main():
@@ -419,6 +745,8 @@ def main():
     parser.add_argument("--baseline", default="latest")
     parser.add_argument("--label-map", default="resche2:schedcost_on,resche_:schedcost_off,ChampSim:latest")
     parser.add_argument("--img-formats", default="svg")
+    parser.add_argument("--debug-keep-script", action="store_true",
+                        help="Also write summarize_afterok.sbatch for troubleshooting")
     args = parser.parse_args()
 
     runner_root = Path(__file__).resolve().parent
@@ -465,13 +793,13 @@ def main():
     append_log(str(debug_log), f"use_trace_configs={use_trace_configs}")
 
     if use_trace_configs:
-        mpath = write_matrix_from_pairs(run_dir, bins, trace_args_pairs)
-        total = sum(1 for _ in open(mpath, "r"))
+        mpath, total = write_matrix_from_pairs(run_dir, bins, trace_args_pairs)
+        assert total == len(bins) * len(trace_args_pairs)
         print(f"tasks={total} bins={len(bins)} traces={num_traces} (trace_configs mode)")
         append_log(str(debug_log), f"tasks={total} bins={len(bins)} traces={num_traces} (trace_configs mode)")
     else:
-        mpath = write_matrix(run_dir, bins, traces, argsets)
-        total = sum(1 for _ in open(mpath, "r"))
+        mpath, total = write_matrix(run_dir, bins, traces, argsets)
+        assert total == len(bins) * len(traces) * len(argsets)
         print(f"tasks={total} bins={len(bins)} traces={len(traces)} args={len(argsets)}")
         append_log(str(debug_log), f"tasks={total} bins={len(bins)} traces={len(traces)} args={len(argsets)}")
 
@@ -504,11 +832,16 @@ def main():
 
     # Default behavior: Automatically submit afterok summarize job (non-blocking)
     if not args.no_auto_summarize:
-        summarize_sbatch = write_summarize_sbatch(
+        if args.debug_keep_script:
+            write_summarize_sbatch(
+                str(runner_root), str(run_dir),
+                args.baseline, args.label_map, args.img_formats
+            )
+        shell_body = summarize_shell_body(
             str(runner_root), str(run_dir),
             args.baseline, args.label_map, args.img_formats
         )
-        summ_jid = submit_summarize_job(str(run_dir), res, job_ids, summarize_sbatch, debug_log=str(debug_log))
+        summ_jid = submit_summarize_job(str(run_dir), res, job_ids, shell_body, debug_log=str(debug_log))
         if summ_jid:
             print(f"Submitted summarize job: {summ_jid} (afterok on {','.join(job_ids)})")
             append_log(str(debug_log), f"summarize_job_id={summ_jid}")